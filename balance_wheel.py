@@ -1,114 +1,164 @@
 import streamlit as st
-import matplotlib.pyplot as plt
-import json
+import plotly.graph_objects as go
+import orjson
 import os
 from datetime import datetime
+import numpy as np
 import pandas as pd
 
-st.set_page_config(page_title="Balance Wheel", layout="centered")
-
-# -----------------------
-# Step 1: App-wide CSS
-# -----------------------
-st.markdown("""
-    <style>
-    /* Global background and text */
-    .main {
-        background-color: #1e1e1e; /* dark gray background */
-        color: #f0f0f0; /* light text */
-    }
-
-    /* Cards */
-    .card {
-        background-color: #2a2a2a; /* slightly lighter dark gray */
-        border-radius: 12px;
-        padding: 15px !important;   /* tighter padding */
-        margin-bottom: 10px !important; /* slimmer spacing */
-        box-shadow: 0 2px 6px rgba(0,0,0,0.3);
-        border-bottom: 1px solid #ffffff; /* subtle divider line */
-    }
-
-    /* Titles inside cards */
-    .cat-title {
-        font-size: 20px;
-        font-weight: bold;
-        margin-bottom: 10px;
-        color: #ffffff; /* pure white for contrast */
-    }
-
-    /* General text */
-    .card, .card * {
-        color: #f0f0f0 !important; /* force light text */
-    }
-
-    /* Slider track */
-    .stSlider > div[data-baseweb="slider"] {
-        background: #333333;  /* dark gray track */
-        border-radius: 8px;
-    }
-
-    /* Slider thumb */
-    .stSlider [role="slider"] {
-        background-color: #888888;  /* grey thumb */
-        border: 2px solid #ffffff;  /* white border for contrast */
-        height: 20px;
-        width: 20px;
-        border-radius: 50%;
-    }
-
-    /* Active (when dragging) */
-    .stSlider [role="slider"]:focus {
-        box-shadow: 0 0 0 4px rgba(108, 99, 255, 0.4);
-    }
+from config import (
+    BASE_COLORS,
+    CATEGORIES,
+    CSS,
+    DATA_FILE,
+    LEGACY_DATA_FILE,
+    MAX_IMPORT_BYTES,
+    PAGE_SIZE,
+)
 
-    /* Slimmer general block container (applies globally) */
-    .block-container {
-        padding-top: 0.25rem !important;
-        padding-bottom: 0.25rem !important;
-    }
+st.set_page_config(page_title="Balance Wheel", layout="centered")
 
-    /* Reduce margin around sliders and text areas */
-    .stSlider, .stTextArea {
-        margin-top: 0.3rem !important;
-        margin-bottom: 0.3rem !important;
-    }
-    </style>
-""", unsafe_allow_html=True)
+st.html(CSS)
 
 st.title("Life Balance")
 st.write("Adjust the sliders below to rate each area (0 = very low, 10 = very high).")
 st.write("You can also add notes for each area.")
 
-# File to store history
-DATA_FILE = "balance_wheel_history.json"
+# Category colors as an array so the highlight pass below is vectorized.
+BASE_COLOR_VEC = np.array([BASE_COLORS[cat] for cat in CATEGORIES], dtype=object)
 
-# Your custom categories
-categories = ["Physical", "Emotional", "Professional", "Creativity", "Financial", "Adventures"]
+# --- Load saved history ---
+# Snapshots are stored struct-of-arrays: {"ratings": [...], "notes": [...]},
+# index-aligned with `CATEGORIES`. That keeps ratings contiguous for the
+# dashboard instead of 12 nested dict lookups per snapshot per rerun.
+def to_soa(snapshot):
+    """Convert a snapshot to the SoA layout; passes new-format ones through."""
+    if "ratings" in snapshot:
+        return snapshot
+    return {
+        "ratings": [snapshot[cat]["rating"] for cat in CATEGORIES],
+        "notes": [snapshot[cat]["note"] for cat in CATEGORIES],
+    }
 
-# --- Fixed base colors per category ---
-base_colors = {
-    "Physical": "blue",
-    "Emotional": "yellow",
-    "Professional": "purple",
-    "Creativity": "teal",
-    "Financial": "grey",
-    "Adventures": "orange"
-}
+def to_nested(history):
+    """Back to the {category: {rating, note}} layout for export/backup files."""
+    return {
+        ts: {
+            cat: {"rating": snap["ratings"][i], "note": snap["notes"][i]}
+            for i, cat in enumerate(CATEGORIES)
+        }
+        for ts, snap in history.items()
+    }
 
-# --- Load saved history ---
-history = {}
-if os.path.exists(DATA_FILE):
-    with open(DATA_FILE, "r") as f:
+# Log lines are compact JSON — no indent; pretty-printing roughly doubles
+# the bytes read back on every load. Only the export download is indented.
+def valid_rating(r):
+    """Slider-range int; bool is excluded since it subclasses int."""
+    return isinstance(r, int) and not isinstance(r, bool) and 0 <= r <= 10
+
+def valid_snapshot(snap):
+    """True when `snap` (either layout) carries one in-range int rating and
+    one str note per category — the contract every rerun relies on, so
+    nothing weaker may reach the log."""
+    if not isinstance(snap, dict):
+        return False
+    if "ratings" in snap or "notes" in snap:
+        ratings = snap.get("ratings")
+        notes = snap.get("notes")
+        return (
+            isinstance(ratings, list)
+            and len(ratings) == len(CATEGORIES)
+            and all(valid_rating(r) for r in ratings)
+            and isinstance(notes, list)
+            and len(notes) == len(CATEGORIES)
+            and all(isinstance(n, str) for n in notes)
+        )
+    return all(
+        isinstance(snap.get(cat), dict)
+        and valid_rating(snap[cat].get("rating"))
+        and isinstance(snap[cat].get("note"), str)
+        for cat in CATEGORIES
+    )
+
+def append_record(record):
+    """Append one save/delete op to the log — O(1) bytes per change."""
+    with open(DATA_FILE, "ab") as f:
+        f.write(orjson.dumps(record, option=orjson.OPT_APPEND_NEWLINE))
+
+def rewrite_log(history):
+    """Rewrite the log as one record per live snapshot (compaction/import)."""
+    with open(DATA_FILE, "wb") as f:
+        for ts, entry in history.items():
+            f.write(orjson.dumps({"ts": ts, "data": entry}, option=orjson.OPT_APPEND_NEWLINE))
+
+# Cached on the file's mtime so reruns skip the JSON parse entirely and we
+# only reparse when the file actually changes on disk.
+@st.cache_data
+def load_history(path, mtime):
+    """Fold the append-only log into {timestamp: snapshot}."""
+    history = {}
+    ops = 0
+    try:
+        with open(path, "rb") as f:
+            for line in f:
+                try:
+                    record = orjson.loads(line)
+                except orjson.JSONDecodeError:
+                    continue  # skip a truncated/corrupt line
+                ops += 1
+                if record.get("tombstone"):
+                    history.pop(record["ts"], None)
+                else:
+                    history[record["ts"]] = to_soa(record["data"])
+    except FileNotFoundError:
+        pass
+    return history, ops
+
+if "history" not in st.session_state:
+    # EAFP: one stat per rerun instead of exists+stat, and no window for
+    # the file to vanish between the check and the open.
+    try:
+        mtime = os.path.getmtime(DATA_FILE)
+    except FileNotFoundError:
+        # No log yet — one-time migration from the old single-document file.
+        try:
+            with open(LEGACY_DATA_FILE, "rb") as f:
+                legacy = orjson.loads(f.read())
+            rewrite_log({ts: to_soa(snap) for ts, snap in legacy.items()})
+        except (FileNotFoundError, orjson.JSONDecodeError):
+            pass
         try:
-            history = json.load(f)
-        except json.JSONDecodeError:
-            history = {}
+            mtime = os.path.getmtime(DATA_FILE)
+        except FileNotFoundError:
+            mtime = 0
+    folded, ops = load_history(DATA_FILE, mtime)
+    # Copy so in-place edits below never mutate the cached object.
+    history = dict(folded)
+    if ops > 2 * max(len(history), 1):
+        rewrite_log(history)  # compact away tombstones and overwrites
+    st.session_state.history = history
+history = st.session_state.history
+
+# Sort the timestamps once and reuse everywhere; the save/delete/reset/
+# import branches drop the cached list so it is rebuilt next rerun.
+sorted_keys = st.session_state.get("_sorted_keys")
+if sorted_keys is None:
+    sorted_keys = sorted(history, reverse=True)  # newest first
+    st.session_state._sorted_keys = sorted_keys
+
+@st.cache_data
+def export_bytes(history):
+    """Pretty-printed backup bytes. st.cache_data hashes the dict by
+    value, so the cache key is the history content itself — stale bytes
+    can never be served, and unchanged reruns skip the nested-layout
+    conversion and serialization."""
+    return orjson.dumps(to_nested(history), option=orjson.OPT_INDENT_2)
 
 # --- Choose a past snapshot to view ---
 if history:
     selected_time = st.selectbox(
         "📜 View past entries",
-        ["(Current Input)"] + list(history.keys())[::-1]  # newest first    
+        ["(Current Input)"] + sorted_keys
     )
 else:
     selected_time = "(Current Input)"
@@ -117,59 +167,61 @@ else:
 if selected_time != "(Current Input)":
     # Viewing past snapshot
     snapshot = history[selected_time]
-    ratings = [snapshot[cat]["rating"] for cat in categories]
-    notes = {cat: snapshot[cat]["note"] for cat in categories}
+    ratings = snapshot["ratings"]
+    notes = snapshot["notes"]
     st.info(f"Showing saved snapshot from {selected_time}")
 else:
     # Current input (editable sliders and notes)
-    latest_data = history[list(history.keys())[-1]] if history else {}
+    # dicts iterate in insertion order, so the last key is the newest save;
+    # reversed() gets it without materializing the whole key list.
+    latest_data = history[next(reversed(history))] if history else None
     ratings = []
-    notes = {}
-    for cat in categories:
-        default_rating = latest_data.get(cat, {}).get("rating", 5)
-        default_note = latest_data.get(cat, {}).get("note", "")
-
-        # Card wrapper (using CSS from Step 1)
-        st.markdown('<div class="card">', unsafe_allow_html=True)
-
-        st.markdown(f"<div class='cat-title'>{cat}</div>", unsafe_allow_html=True)
-        rating = st.slider(f"{cat} rating", 0, 10, default_rating, key=f"slider_{cat}")
-        note = st.text_area(f"Notes for {cat}", default_note, key=f"note_{cat}")
-
-        st.markdown('</div>', unsafe_allow_html=True)  # close card
-
-        ratings.append(rating)
-        notes[cat] = note
+    notes = []
+    # A form batches all slider/textarea edits into one rerun on submit,
+    # instead of rerunning the whole script per keystroke or slider tick.
+    with st.form("ratings"):
+        for i, cat in enumerate(CATEGORIES):
+            default_rating = latest_data["ratings"][i] if latest_data else 5
+            default_note = latest_data["notes"][i] if latest_data else ""
+
+            # Card header (using CSS from Step 1) as a single markdown call —
+            # Streamlit renders each markdown as its own closed block, so the
+            # old open-div/close-div pair never actually wrapped the widgets.
+            st.markdown(
+                f'<div class="card"><div class="cat-title">{cat}</div></div>',
+                unsafe_allow_html=True,
+            )
+            rating = st.slider(f"{cat} rating", 0, 10, default_rating, key=f"slider_{cat}")
+            note = st.text_area(f"Notes for {cat}", default_note, key=f"note_{cat}")
+
+            ratings.append(rating)
+            notes.append(note)
+
+        st.form_submit_button("🔄 Update")
 
 # --- Pie chart with consistent colors and highlights ---
-fig, ax = plt.subplots(figsize=(6, 6))
-
-max_rating = max(ratings)
-min_rating = min(ratings)
-
-colors = []
-for i, cat in enumerate(categories):
-    if ratings[i] == max_rating:
-        colors.append("green")  # highlight highest
-    elif ratings[i] == min_rating:
-        colors.append("red")    # highlight lowest
-    else:
-        colors.append(base_colors[cat])  # consistent category color
-
-ax.pie(
-    ratings,
-    labels=categories,
-    autopct="%1.1f%%",
-    startangle=90,
-    colors=colors
-)
-
-ax.set_title("Your Balance Wheel", fontsize=16)
-st.pyplot(fig)
+r = np.fromiter(ratings, dtype=np.int8, count=len(ratings))
+colors = BASE_COLOR_VEC.copy()
+colors[r == r.min()] = "red"    # highlight lowest
+colors[r == r.max()] = "green"  # highlight highest
+colors = colors.tolist()
+
+# Plotly sends a small JSON spec that the browser renders client-side —
+# no server-side PNG rasterization per rerun, and an unchanged spec is
+# skipped by Streamlit's diffing, so no figure cache is needed.
+fig = go.Figure(go.Pie(
+    labels=CATEGORIES,
+    values=ratings,
+    marker_colors=colors,
+    textinfo="label+percent",
+    rotation=90,
+))
+fig.update_layout(title_text="Your Balance Wheel", title_font_size=16)
+st.plotly_chart(fig, width="stretch")
 
 # --- Display notes ---
 st.subheader("📝 Your Notes")
-for cat, note in notes.items():
+for cat, note in zip(CATEGORIES, notes):
     if note.strip():
         st.markdown(f"**{cat}:** {note}")
 
@@ -177,80 +229,100 @@ for cat, note in notes.items():
 if selected_time == "(Current Input)":
     if st.button("💾 Save Progress"):
         timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        history[timestamp] = {
-            cat: {"rating": ratings[i], "note": notes[cat]}
-            for i, cat in enumerate(categories)
-        }
-        with open(DATA_FILE, "w") as f:
-            json.dump(history, f, indent=4)
+        entry = {"ratings": list(ratings), "notes": list(notes)}
+        history[timestamp] = entry
+        append_record({"ts": timestamp, "data": entry})
+        # Insert at the front (newest first) so the dashboard and
+        # manage-saves sections below see the new snapshot this run;
+        # the list is the session-state one, so it stays current. The
+        # guard covers a re-save within the same second.
+        if not sorted_keys or sorted_keys[0] != timestamp:
+            sorted_keys.insert(0, timestamp)
         st.success(f"✅ Progress saved at {timestamp}")
 
 # --- Mini History Dashboard ---
 if history:
-    st.subheader("📊 Past Snapshots Dashboard")
-    for ts in sorted(history.keys(), reverse=True):  # newest first
-        snapshot = history[ts]
-        st.markdown(f"**Timestamp:** {ts}")
-        # Build a DataFrame for display
-        df = pd.DataFrame({
-            "Category": categories,
-            "Rating": [snapshot[cat]["rating"] for cat in categories],
-            "Note": [snapshot[cat]["note"] for cat in categories]
-        })
-        st.table(df)
-
-import io
+    # Collapsed by default so routine reruns don't pay for history rendering.
+    with st.expander("📊 Past Snapshots Dashboard"):
+        if st.checkbox("Load dashboard", key="_load_dash"):
+            n_pages = (len(sorted_keys) - 1) // PAGE_SIZE + 1
+            page = 0
+            if n_pages > 1:
+                page = st.number_input("Page", 0, n_pages - 1, 0, key="_dash_page")
+            # The SoA layout turns the page into one contiguous int8 array —
+            # no per-snapshot dict walking. Notes stay viewable through the
+            # snapshot selector above.
+            page_keys = sorted_keys[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]
+            ratings_arr = np.array(
+                [history[ts]["ratings"] for ts in page_keys], dtype=np.int8
+            )
+            df = pd.DataFrame(
+                ratings_arr,
+                index=pd.Index(page_keys, name="Timestamp"),
+                columns=CATEGORIES,
+            )
+            st.dataframe(df, width="stretch")
 
 # EXPORT (download) your history as JSON
 if history:
     st.download_button(
         "📥 Export history (download JSON)",
-        data=json.dumps(history, indent=4),
+        data=export_bytes(history),  # raw bytes, no re-encode
         file_name="balance_wheel_history.json",
         mime="application/json"
     )
 
 # IMPORT (upload) a JSON backup to restore
 uploaded = st.file_uploader("📤 Upload JSON backup to restore (will overwrite)", type=["json"])
-if uploaded:
-    try:
-        new_hist = json.load(uploaded)
-        with open(DATA_FILE, "w") as f:
-            json.dump(new_hist, f, indent=4)
-        st.success("Imported backup — app will refresh to show restored data.")
-        st.session_state.refresh_flag = not st.session_state.get("refresh_flag", False)
-    except Exception as e:
-        st.error("Failed to import JSON: " + str(e))
+# The uploader keeps its file across reruns, so remember what was already
+# imported — otherwise the st.rerun() below would re-import it forever.
+if uploaded and st.session_state.get("_imported_id") != uploaded.file_id:
+    if uploaded.size > MAX_IMPORT_BYTES:
+        st.error("Backup too large to import (limit is 10 MB).")
+    else:
+        try:
+            new_hist = orjson.loads(uploaded.read())
+            # Check the shape before anything touches disk, so a stray
+            # JSON file can't clobber real history.
+            if not isinstance(new_hist, dict):
+                raise ValueError("backup must be a JSON object of snapshots")
+            for ts, snap in new_hist.items():
+                if not valid_snapshot(snap):
+                    raise ValueError(f"snapshot {ts} has missing or malformed categories")
+            new_hist = {ts: to_soa(snap) for ts, snap in new_hist.items()}
+            rewrite_log(new_hist)
+            st.session_state.history = new_hist
+            st.session_state.pop("_sorted_keys", None)
+            st.session_state._imported_id = uploaded.file_id
+            st.rerun()
+        except Exception as e:
+            st.error("Failed to import JSON: " + str(e))
 
 # --- Manage Saves Section with Automatic Refresh ---
-st.subheader("⚙️ Manage Saved Progress")
-
-if "refresh_flag" not in st.session_state:
-    st.session_state.refresh_flag = False
-
 if history:
-    st.write("### Saved Snapshots")
-    
-    for ts in sorted(history.keys(), reverse=True):
-        col1, col2 = st.columns([3,1])
-        with col1:
-            st.write(ts)
-        with col2:
-            if st.button(f"Delete", key=f"del_{ts}"):
-                del history[ts]
-                with open(DATA_FILE, "w") as f:
-                    json.dump(history, f, indent=4)
-                st.success(f"Deleted snapshot {ts}")
-                st.session_state.refresh_flag = not st.session_state.refresh_flag
-
-    if st.button("⚠️ Reset All Progress"):
-        history.clear()
-        if os.path.exists(DATA_FILE):
-            os.remove(DATA_FILE)
-        st.success("All progress has been reset!")
-        st.session_state.refresh_flag = not st.session_state.refresh_flag
-
-# Trigger automatic refresh via session state
-if st.session_state.refresh_flag:
-    st.session_state.refresh_flag = False  # reset flag
-    st.experimental_rerun()
\ No newline at end of file
+    with st.expander("⚙️ Manage Saved Progress"):
+        if st.checkbox("Load saved snapshots", key="_load_manage"):
+            n_pages = (len(sorted_keys) - 1) // PAGE_SIZE + 1
+            page = 0
+            if n_pages > 1:
+                page = st.number_input("Page", 0, n_pages - 1, 0, key="_manage_page")
+            for ts in sorted_keys[page * PAGE_SIZE:(page + 1) * PAGE_SIZE]:
+                col1, col2 = st.columns([3,1])
+                with col1:
+                    st.write(ts)
+                with col2:
+                    if st.button(f"Delete", key=f"del_{ts}"):
+                        del history[ts]
+                        append_record({"ts": ts, "tombstone": True})
+                        st.session_state.pop("_sorted_keys", None)
+                        st.rerun()
+
+            if st.button("⚠️ Reset All Progress"):
+                history.clear()
+                st.session_state.pop("_sorted_keys", None)
+                for path in (DATA_FILE, LEGACY_DATA_FILE):
+                    try:
+                        os.remove(path)
+                    except FileNotFoundError:
+                        pass
+                st.rerun()
\ No newline at end of file
@@ -0,0 +1,101 @@
+"""Static configuration for the Balance Wheel app.
+
+Everything here is constant for the lifetime of the process, so it lives
+outside the Streamlit rerun path.
+"""
+import os
+
+# Append-only history log: one JSON record per line, newest op wins.
+# Overridable so separate deployments can point at their own data file.
+DATA_FILE = os.environ.get("BW_DATA", "balance_wheel_history.jsonl")
+# Old single-document format, folded into the log on first run.
+LEGACY_DATA_FILE = "balance_wheel_history.json"
+
+# Your custom categories
+CATEGORIES = ["Physical", "Emotional", "Professional", "Creativity", "Financial", "Adventures"]
+
+# --- Fixed base colors per category ---
+BASE_COLORS = {
+    "Physical": "blue",
+    "Emotional": "yellow",
+    "Professional": "purple",
+    "Creativity": "teal",
+    "Financial": "grey",
+    "Adventures": "orange"
+}
+
+# Snapshots shown per page in the history sections, so widget count per
+# rerun stays bounded no matter how large the history grows.
+PAGE_SIZE = 20
+
+# Refuse to parse uploaded backups beyond this size — keeps a pathological
+# file from blowing up memory before validation even runs.
+MAX_IMPORT_BYTES = 10 * 1024 * 1024
+
+# App-wide CSS. st.html is cheaper than markdown with unsafe_allow_html,
+# and the block must be re-emitted each rerun or Streamlit prunes it from
+# the page.
+CSS = """
+    <style>
+    /* Global background and text */
+    .main {
+        background-color: #1e1e1e; /* dark gray background */
+        color: #f0f0f0; /* light text */
+    }
+
+    /* Cards */
+    .card {
+        background-color: #2a2a2a; /* slightly lighter dark gray */
+        border-radius: 12px;
+        padding: 15px !important;   /* tighter padding */
+        margin-bottom: 10px !important; /* slimmer spacing */
+        box-shadow: 0 2px 6px rgba(0,0,0,0.3);
+        border-bottom: 1px solid #ffffff; /* subtle divider line */
+    }
+
+    /* Titles inside cards */
+    .cat-title {
+        font-size: 20px;
+        font-weight: bold;
+        margin-bottom: 10px;
+        color: #ffffff; /* pure white for contrast */
+    }
+
+    /* General text */
+    .card, .card * {
+        color: #f0f0f0 !important; /* force light text */
+    }
+
+    /* Slider track */
+    .stSlider > div[data-baseweb="slider"] {
+        background: #333333;  /* dark gray track */
+        border-radius: 8px;
+    }
+
+    /* Slider thumb */
+    .stSlider [role="slider"] {
+        background-color: #888888;  /* grey thumb */
+        border: 2px solid #ffffff;  /* white border for contrast */
+        height: 20px;
+        width: 20px;
+        border-radius: 50%;
+    }
+
+    /* Active (when dragging) */
+    .stSlider [role="slider"]:focus {
+        box-shadow: 0 0 0 4px rgba(108, 99, 255, 0.4);
+    }
+
+    /* Slimmer general block container (applies globally) */
+    .block-container {
+        padding-top: 0.25rem !important;
+        padding-bottom: 0.25rem !important;
+    }
+
+    /* Reduce margin around sliders and text areas */
+    .stSlider, .stTextArea {
+        margin-top: 0.3rem !important;
+        margin-bottom: 0.3rem !important;
+    }
+    </style>
+"""